@@ -20,6 +20,12 @@ import tokenize
 from pysb.logging import get_logger, EXTENDED_DEBUG
 from sympy.logic.boolalg import Boolean
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+import functools
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 
 def set_bng_path(dir):
@@ -193,7 +199,7 @@ class BngBaseInterface(object):
         return self.read_simulation_results_multi([self.base_filename])[0]
 
     @staticmethod
-    def read_simulation_results_multi(base_filenames):
+    def read_simulation_results_multi(base_filenames, cache_parsed=False):
         """
         Read the results of multiple BNG simulations
 
@@ -202,6 +208,13 @@ class BngBaseInterface(object):
         base_filenames: list of str
             A list of filename stems to read simulation results in from,
             including the full path but not including any file extension.
+        cache_parsed: bool
+            If True, save each parsed result next to the BNG output as a
+            .npy file, and return it memory-mapped (read only) rather than
+            in memory. Later calls load the .npy file instead of parsing
+            the BNG output again, unless the BNG output has changed (a
+            .npy.stamp file records the output's sizes and mtimes). Useful
+            for large results which are only read once, or read repeatedly.
 
         Returns
         -------
@@ -210,46 +223,138 @@ class BngBaseInterface(object):
             species/observables/expressions on X axis depending on
             simulation type)
         """
-        list_of_yfulls = []
-        for base_filename in base_filenames:
-            names = ['time']
+        read_result = functools.partial(
+            BngBaseInterface._read_simulation_result,
+            cache_parsed=cache_parsed)
+        if pd is None or len(base_filenames) < 2:
+            return [read_result(base_filename)
+                    for base_filename in base_filenames]
 
-            # Read concentrations data
-            try:
-                cdat_arr = numpy.loadtxt(base_filename + '.cdat', skiprows=1, ndmin=2)
-                # -1 for time column
-                names += ['__s%d' % i for i in range(cdat_arr.shape[1] - 1)]
-            except IOError:
-                cdat_arr = None
+        # The pandas parser releases the GIL, so read files in parallel
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(read_result, base_filenames))
+
+    @staticmethod
+    def _read_simulation_result(base_filename, cache_parsed=False):
+        """
+        Read the results of a single BNG simulation
 
-            # Read groups data
+        Parameters
+        ----------
+        base_filename: str
+            Filename stem to read simulation results in from, including the
+            full path but not including any file extension.
+        cache_parsed: bool
+            See :func:`read_simulation_results_multi`
+
+        Returns
+        -------
+        numpy.ndarray
+            Simulation results in a 2D matrix (time on Y axis,
+            species/observables/expressions on X axis depending on
+            simulation type)
+        """
+        if cache_parsed:
+            cache_filename = base_filename + '.npy'
+            # The cache is only valid for the exact BNG output it was parsed
+            # from, identified by the output files' sizes and mtimes (which
+            # alone can be too coarse to notice a rewrite)
+            stamp_filename = cache_filename + '.stamp'
+            stamp = _bng_output_stamp(base_filename)
             try:
-                with open(base_filename + '.gdat', 'r') as f:
-                    # Exclude \# and time column
-                    names += f.readline().split()[2:]
-                    # Exclude first column (time)
-                    gdat_arr = numpy.loadtxt(f, ndmin=2)
-                    if cdat_arr is None:
-                        cdat_arr = numpy.ndarray((len(gdat_arr), 0))
-                    else:
-                        gdat_arr = gdat_arr[:, 1:]
+                with open(stamp_filename, 'r') as f:
+                    cache_valid = stamp and f.read() == stamp
             except IOError:
+                cache_valid = False
+            if cache_valid and os.path.exists(cache_filename):
+                return numpy.load(cache_filename, mmap_mode='r')
+
+        names = ['time']
+
+        # Read concentrations data
+        try:
+            cdat_arr = _read_bng_data(base_filename + '.cdat', skiprows=1)
+            # -1 for time column
+            names += ['__s%d' % i for i in range(cdat_arr.shape[1] - 1)]
+        except IOError:
+            cdat_arr = None
+
+        # Read groups data
+        try:
+            with open(base_filename + '.gdat', 'r') as f:
+                # Exclude \# and time column
+                names += f.readline().split()[2:]
+                # Exclude first column (time)
+                gdat_arr = _read_bng_data(f)
                 if cdat_arr is None:
-                    raise BngInterfaceError('Need at least one of .cdat file or '
-                                            '.gdat file to read simulation '
-                                            'results')
-                gdat_arr = numpy.ndarray((len(cdat_arr), 0))
+                    cdat_arr = numpy.ndarray((len(gdat_arr), 0))
+                else:
+                    gdat_arr = gdat_arr[:, 1:]
+        except IOError:
+            if cdat_arr is None:
+                raise BngInterfaceError('Need at least one of .cdat file or '
+                                        '.gdat file to read simulation '
+                                        'results')
+            gdat_arr = numpy.ndarray((len(cdat_arr), 0))
+
+        yfull_dtype = list(zip(names, itertools.repeat(float)))
+        yfull = numpy.ndarray(len(cdat_arr), yfull_dtype)
+
+        yfull_view = yfull.view(float).reshape(len(yfull), -1)
+        yfull_view[:, :cdat_arr.shape[1]] = cdat_arr
+        yfull_view[:, cdat_arr.shape[1]:] = gdat_arr
+
+        if cache_parsed:
+            if os.path.exists(stamp_filename):
+                os.remove(stamp_filename)
+            numpy.save(cache_filename, yfull)
+            with open(stamp_filename, 'w') as f:
+                f.write(stamp)
+            return numpy.load(cache_filename, mmap_mode='r')
+
+        return yfull
+
+
+def _bng_output_stamp(base_filename):
+    """ Identify BNG output files by their size and mtime, or '' if none """
+    stamp = []
+    for ext in ('.cdat', '.gdat'):
+        try:
+            st = os.stat(base_filename + ext)
+        except OSError:
+            continue
+        stamp.append('%s %d %d\n' % (ext, st.st_size, st.st_mtime_ns))
+    return ''.join(stamp)
 
-            yfull_dtype = list(zip(names, itertools.repeat(float)))
-            yfull = numpy.ndarray(len(cdat_arr), yfull_dtype)
 
-            yfull_view = yfull.view(float).reshape(len(yfull), -1)
-            yfull_view[:, :cdat_arr.shape[1]] = cdat_arr
-            yfull_view[:, cdat_arr.shape[1]:] = gdat_arr
+def _read_bng_data(f, skiprows=0):
+    """
+    Read a whitespace delimited BNG data file (.cdat, .gdat) into a 2D array
 
-            list_of_yfulls.append(yfull)
+    Uses the pandas C parser when available, which is much faster than
+    numpy.loadtxt for large trajectory files.
 
-        return list_of_yfulls
+    Parameters
+    ----------
+    f: str or file
+        Filename or open file object, positioned after any header lines
+        not covered by `skiprows`
+    skiprows: int
+        Number of lines to skip at the start of the file
+
+    Returns
+    -------
+    numpy.ndarray
+        2D array of the file's numeric data
+    """
+    if pd is not None:
+        try:
+            return pd.read_csv(f, sep=r'\s+', skiprows=skiprows,
+                               header=None, dtype=float).to_numpy()
+        except pd.errors.EmptyDataError:
+            # Same shape as numpy.loadtxt(..., ndmin=2) gives for no data
+            return numpy.empty((0, 1))
+    return numpy.loadtxt(f, skiprows=skiprows, ndmin=2)
 
 
 class BngConsole(BngBaseInterface):
@@ -488,14 +593,27 @@ class BngFileInterface(BngBaseInterface):
         # Process BNG arguments into a string
         action_args = self._format_action_args(**kwargs)
 
-        # Add the command to the queue
+        self._queue_action(action, action_args)
+
+    def _queue_action(self, action, action_args):
+        """
+        Adds a BNG action command with preformatted arguments to the queue
+
+        Useful when the same (potentially long) arguments are used for many
+        actions, so they only need formatting once.
+
+        Parameters
+        ----------
+        action : string
+            The name of the BNG action function
+        action_args : string
+            Arguments as formatted by :func:`_format_action_args`
+        """
         if action_args == '':
             self.command_queue.write('\t%s()\n' % action)
         else:
             self.command_queue.write('\t%s({%s})\n' % (action, action_args))
 
-        return
-
     def set_parameter(self, name, value):
         """
         Generates a BNG action command and adds it to the command queue
@@ -2213,6 +2213,33 @@ class Model(object):
                  len(self.expressions), len(self.compartments), id(self)))
 
 
+class _SpeciesIndex(object):
+    """Look up species indices without scanning the species list each time
+
+    Species are first looked up by identity, then by their string
+    representation (confirmed with is_equivalent_to). Anything else falls
+    back to :meth:`pysb.Model.get_species_index`.
+    """
+    def __init__(self, model):
+        self._model = model
+        self._by_id = {id(sp): i for i, sp in enumerate(model.species)}
+        self._by_str = None
+
+    def __getitem__(self, cp):
+        try:
+            return self._by_id[id(cp)]
+        except KeyError:
+            pass
+        if self._by_str is None:
+            self._by_str = collections.defaultdict(list)
+            for i, sp in enumerate(self._model.species):
+                self._by_str[str(sp)].append(i)
+        for i in self._by_str.get(str(cp), ()):
+            if self._model.species[i].is_equivalent_to(cp):
+                return i
+        return self._model.get_species_index(cp)
+
+
 
 class InvalidComplexPatternException(Exception):
     """Expression can not be cast as a ComplexPattern."""
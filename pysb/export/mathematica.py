@@ -197,8 +197,9 @@ class MathematicaExporter(Exporter):
 
         ## INITIAL CONDITIONS
         ic_values = ['0'] * len(self.model.odes)
+        species_index = pysb.core._SpeciesIndex(self.model)
         for i, ic in enumerate(self.model.initials):
-            idx = self.model.get_species_index(ic.pattern)
+            idx = species_index[ic.pattern]
             ic_values[idx] = ic.value.name.replace('_', '')
 
         init_conds_str = 'initconds = {\n'
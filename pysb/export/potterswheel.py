@@ -95,8 +95,9 @@ class PottersWheelExporter(Exporter):
         model_name = self.model.name.replace('.', '_')
 
         ic_values = [0] * len(self.model.odes)
+        species_index = pysb.core._SpeciesIndex(self.model)
         for ic in self.model.initials:
-            ic_values[self.model.get_species_index(ic.pattern)] = ic.value.value
+            ic_values[species_index[ic.pattern]] = ic.value.value
 
         # list of "dynamic variables"
         pw_x = ["m = pwAddX(m, 's%d', %.17g);" % (i, ic_values[i])
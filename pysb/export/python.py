@@ -173,9 +173,10 @@ class PythonExporter(Exporter):
             output.write("self.observables[%d] = Observable(%s, %s, %s)\n" %
                          obs_data)
         output.write("\n")
+        species_index = pysb.core._SpeciesIndex(self.model)
         for i, ic in enumerate(self.model.initials):
             ic_data = (i, self.model.parameters.index(ic.value),
-                       self.model.get_species_index(ic.pattern))
+                       species_index[ic.pattern])
             output.write(" " * 8)
             output.write("self.initials[%d] = Initial(%d, %d)\n" % ic_data)
         output.write("\n")
@@ -176,8 +176,9 @@ class SbmlExporter(Exporter):
         # Initial values/assignments
         fixed_species_idx = set()
         initial_species_idx = set()
+        species_index = pysb.core._SpeciesIndex(self.model)
         for ic in self.model.initials:
-            sp_idx = self.model.get_species_index(ic.pattern)
+            sp_idx = species_index[ic.pattern]
             ia = smodel.createInitialAssignment()
             _check(ia)
             _check(ia.setSymbol('__s{}'.format(sp_idx)))
@@ -8,7 +8,8 @@ For information on how to use the model exporters, see the documentation
 for :py:mod:`pysb.export`.
 """
 from pysb.export import Exporter, CompartmentsNotSupported
-from pysb.core import as_complex_pattern, Expression, Parameter
+from pysb.core import as_complex_pattern, Expression, Parameter, \
+    _SpeciesIndex
 from pysb.bng import generate_equations
 import numpy as np
 import sympy
@@ -30,6 +31,17 @@ class StochKitExporter(Exporter):
     Inherits from :py:class:`pysb.export.Exporter`, which implements
     basic functionality for all exporters.
     """
+    @staticmethod
+    def _falling_factorial_powers(expr):
+        """ Rewrite species powers s**k as s*(s-1)*...*(s-k+1) """
+        return expr.replace(
+            lambda e: e.is_Pow and e.base.is_Symbol and
+            e.base.name.startswith('__s') and e.exp.is_Integer and
+            e.exp > 1,
+            lambda e: sympy.Mul(*[e.base - i for i in range(int(e.exp))],
+                                evaluate=False)
+        )
+
     @staticmethod
     def _species_to_element(species_num, species_val):
         e = etree.Element('Species')
@@ -167,9 +179,11 @@ class StochKitExporter(Exporter):
             subs = dict((p, param_values[i]) for i, p in
                         enumerate(self.model.parameters))
 
+            species_index = _SpeciesIndex(self.model)
+
             for ic in self.model.initials:
                 cp = as_complex_pattern(ic.pattern)
-                si = self.model.get_species_index(cp)
+                si = species_index[cp]
                 if si is None:
                     raise IndexError("Species not found in model: %s" %
                                      repr(cp))
@@ -177,7 +191,7 @@ class StochKitExporter(Exporter):
                     pi = self.model.parameters.index(ic.value)
                     value = param_values[pi]
                 elif ic.value in self.model.expressions:
-                    value = ic.value.expand_expr().evalf(subs=subs)
+                    value = float(ic.value.expand_expr().xreplace(subs))
                 else:
                     raise ValueError(
                         "Unexpected initial condition value type")
@@ -225,7 +239,6 @@ class StochKitExporter(Exporter):
 
         # Reactions
         reacs = etree.Element('ReactionsList')
-        pattern = re.compile("(__s\d+)\*\*(\d+)")
         for rxn_id, rxn in enumerate(self.model.reactions):
             rxn_name = 'Rxn%d' % rxn_id
             rxn_desc = 'Rules: %s' % str(rxn["rule"])
@@ -238,22 +251,6 @@ class StochKitExporter(Exporter):
             # products
             for p in rxn["products"]:
                 products["__s%d" % p] += 1
-            # replace terms like __s**2 with __s*(__s-1)
-            rate = str(rxn["rate"])
-
-            matches = pattern.findall(rate)
-            for m in matches:
-                repl = m[0]
-                for i in range(1, int(m[1])):
-                    repl += "*(%s-%d)" % (m[0], i)
-                rate = re.sub(pattern, repl, rate, count=1)
-
-            # expand only expressions used in the rate eqn
-            for e in {sym for sym in rxn["rate"].atoms()
-                      if isinstance(sym, Expression)}:
-                rate = re.sub(r'\b%s\b' % e.name,
-                              expr_strings[e.name],
-                              rate)
 
             total_reactants = sum(reactants.values())
             rxn_params = rxn["rate"].atoms(Parameter)
@@ -294,14 +291,7 @@ class StochKitExporter(Exporter):
                     rxn_atoms = rxn["rate"].atoms()
 
                     # replace terms like __s**2 with __s*(__s-1)
-                    rate = str(rxn["rate"])
-
-                    matches = pattern.findall(rate)
-                    for m in matches:
-                        repl = m[0]
-                        for i in range(1, int(m[1])):
-                            repl += "*(%s-%d)" % (m[0], i)
-                        rate = re.sub(pattern, repl, rate, count=1)
+                    rate = str(self._falling_factorial_powers(rxn["rate"]))
 
                     # expand only expressions used in the rate eqn
                     for e in {sym for sym in rxn_atoms
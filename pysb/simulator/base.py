@@ -2,11 +2,13 @@ from abc import ABCMeta, abstractmethod
 import numpy as np
 import itertools
 import sympy
+import scipy.sparse
 import collections
 from collections.abc import Mapping, Sequence
 import numbers
 from pysb.core import MonomerPattern, ComplexPattern, as_complex_pattern, \
-                      Parameter, Expression, Model, ComponentSet
+                      Parameter, Expression, Model, ComponentSet, \
+                      _SpeciesIndex
 from pysb.logging import get_logger, EXTENDED_DEBUG
 import pickle
 from pysb.export.json import JsonExporter
@@ -28,6 +30,15 @@ try:
     import h5py
 except ImportError:
     h5py = None
+try:
+    import numexpr
+    from sympy.printing.lambdarepr import NumExprPrinter
+    # Functions lambdify can translate to numexpr. Anything else (e.g. Max,
+    # Min) is printed as a call numexpr only rejects when evaluated.
+    _NUMEXPR_FUNCTIONS = frozenset(NumExprPrinter._numexpr_functions) | \
+        {'Piecewise'}
+except ImportError:
+    numexpr = None
 
 
 class SimulatorException(Exception):
@@ -170,7 +181,8 @@ class Simulator(object):
             else:
                 return len(self.param_values)
 
-    def _update_initials_dict(self, initials_dict, initials_source, subs=None):
+    def _update_initials_dict(self, initials_dict, initials_source,
+                              param_values=None):
         if isinstance(initials_source, Mapping):
             # Can't just use .update() as we need to test
             # equality with .is_equivalent_to()
@@ -184,11 +196,23 @@ class Simulator(object):
                         and all(isinstance(v, numbers.Number) for v in value_obj):
                     value = value_obj
                 elif isinstance(value_obj, Expression):
-                    value = [value_obj.expand_expr().xreplace(subs[sim]) for sim in range(len(subs))]
+                    # Evaluate over all simulations at once, using a function
+                    # of the parameters it uses compiled with lambdify. The
+                    # Parameter symbols are passed rather than their names,
+                    # which lambdify replaces if they aren't valid Python
+                    # identifiers (e.g. 'lambda')
+                    expr = value_obj.expand_expr()
+                    params = sorted(expr.free_symbols,
+                                    key=self._model.parameters.index)
+                    func = _lambdify_expression(tuple(params), expr,
+                                                use_numexpr=False)
+                    value = np.empty(len(param_values))
+                    value[:] = func(*param_values[:, [
+                        self._model.parameters.index(p) for p in params]].T)
                 elif isinstance(value_obj, Parameter):
                     # Set parameter using param_values
                     pi = self._model.parameters.index(value_obj)
-                    value = [self.param_values[sim][pi] for sim in range(len(self.param_values))]
+                    value = self.param_values[:, pi]
                 else:
                     raise TypeError("Unexpected initial condition "
                                     "value type: %s" % type(value_obj))
@@ -231,19 +255,16 @@ class Simulator(object):
 
         # Get remaining initials from the model itself and
         # self.param_values, if necessary
-        subs = None
+        param_values = None
         if any(isinstance(v, Expression) for v in model_initials.values()):
-            # Only need parameter substitutions if model initials include
+            # Only need parameter values if model initials include
             # expressions
-            subs = [
-                dict((p, pv[i]) for i, p in
-                     enumerate(self._model.parameters))
-                for pv in self.param_values]
-            if len(subs) == 1 and n_sims_actual > 1:
-                subs = list(itertools.repeat(subs[0], n_sims_actual))
+            param_values = self.param_values[:, :len(self._model.parameters)]
+            if len(param_values) == 1 and n_sims_actual > 1:
+                param_values = np.repeat(param_values, n_sims_actual, axis=0)
 
         initials_dict = self._update_initials_dict(
-            initials_dict, model_initials, subs=subs
+            initials_dict, model_initials, param_values=param_values
         )
 
         return initials_dict
@@ -299,9 +320,9 @@ class Simulator(object):
 
         y0 = np.full((n_sims_actual, len(self.model.species)), 0.0)
 
+        species_index = _SpeciesIndex(self._model)
         for species, vals in self.initials_dict.items():
-            species_index = self._model.get_species_index(species)
-            y0[:, species_index] = vals
+            y0[:, species_index[species]] = vals
 
         return y0
 
@@ -317,9 +338,10 @@ class Simulator(object):
         if pd and isinstance(new_initials, pd.DataFrame):
             new_initials = new_initials.to_dict(orient='list')
 
-        # If new_initials is a list, convert to numpy array
-        if isinstance(new_initials, list):
-            new_initials = np.array(new_initials, copy=False)
+        # Store array-like initials as a contiguous 2D float array, so
+        # downstream code doesn't need to convert them again
+        if isinstance(new_initials, (list, np.ndarray)):
+            new_initials = np.ascontiguousarray(new_initials, dtype=float)
 
         # Check if new_initials is a dict, and if so validate the keys
         # (ComplexPatterns)
@@ -327,6 +349,7 @@ class Simulator(object):
             n_sims = 1
             if len(new_initials) > 0:
                 n_sims = self._num_sims_calc(new_initials)
+            initials_dict = {}
             for cplx_pat, val in new_initials.items():
                 if not isinstance(cplx_pat, (MonomerPattern,
                                              ComplexPattern)):
@@ -336,7 +359,6 @@ class Simulator(object):
                 # if val is a number, convert it to a single-element array
                 if not isinstance(val, (Sequence, np.ndarray)):
                     val = [val]
-                    new_initials[cplx_pat] = np.array(val)
                 # otherwise, check whether simulator supports multiple
                 # initial values :
                 if len(val) != n_sims:
@@ -345,10 +367,13 @@ class Simulator(object):
                 if not np.isfinite(val).all():
                     raise ValueError('Please check initial {} for non-finite '
                                      'values'.format(cplx_pat))
+                initials_dict[cplx_pat] = np.ascontiguousarray(val,
+                                                               dtype=float)
+            new_initials = initials_dict
         elif isinstance(new_initials, np.ndarray):
             # if new_initials is a 1D array, convert to a 2D array of length 1
-            if len(new_initials.shape) == 1:
-                new_initials = np.resize(new_initials, (1, len(new_initials)))
+            if new_initials.ndim == 1:
+                new_initials = new_initials.reshape(1, -1)
             n_sims = new_initials.shape[0]
             # make sure number of initials values equals len(model.species)
             if new_initials.shape[1] != len(self._model.species):
@@ -433,16 +458,15 @@ class Simulator(object):
         )
         param_values = np.repeat([param_values], n_sims, axis=0)
         # Process overrides
-        for key in param_values_dict.keys():
+        param_index = {p.name: i for i, p in
+                       enumerate(self._model.parameters)}
+        for key, values in param_values_dict.items():
             try:
-                pi = self._model.parameters.index(
-                                self._model.parameters[key])
+                pi = param_index[key]
             except KeyError:
                 raise IndexError("new_params dictionary has unknown "
                                  "parameter name (%s)" % key)
-            # loop over n_sims
-            for n in range(n_sims):
-                param_values[n][pi] = param_values_dict[key][n]
+            param_values[:, pi] = values[:n_sims]
 
         return param_values
 
@@ -458,22 +482,24 @@ class Simulator(object):
         if pd and isinstance(new_params, pd.DataFrame):
             new_params = new_params.to_dict(orient='list')
 
-        # If new_params is a list, convert to numpy array
-        if isinstance(new_params, list):
-            new_params = np.array(new_params)
+        # Store array-like parameters as a contiguous 2D float array, so
+        # downstream code doesn't need to convert them again
+        if isinstance(new_params, (list, np.ndarray)):
+            new_params = np.ascontiguousarray(new_params, dtype=float)
 
         if isinstance(new_params, dict):
             n_sims = 1
             if len(new_params) > 0:
                 n_sims = self._num_sims_calc(new_params)
+            param_names = set(self._model.parameters.keys())
+            params_dict = {}
             for key, val in new_params.items():
-                if key not in self._model.parameters.keys():
+                if key not in param_names:
                     raise IndexError("new_params dictionary has unknown "
                                      "parameter name (%s)" % key)
                 # if val is a number, convert it to a single-element array
-                if not isinstance(val, Sequence):
+                if not isinstance(val, (Sequence, np.ndarray)):
                     val = [val]
-                    new_params[key] = np.array(val)
                 # Check all elements are the same length
                 if len(val) != n_sims:
                     raise ValueError("all arrays in params dictionary "
@@ -486,11 +512,13 @@ class Simulator(object):
                         raise InconsistentParameterError(
                             key, value, str(e)
                         )
+                params_dict[key] = np.ascontiguousarray(val, dtype=float)
+            new_params = params_dict
 
         elif isinstance(new_params, np.ndarray):
             # if new_params is a 1D array, convert to a 2D array of length 1
-            if len(new_params.shape) == 1:
-                new_params = np.resize(new_params, (1, len(new_params)))
+            if new_params.ndim == 1:
+                new_params = new_params.reshape(1, -1)
             n_sims = new_params.shape[0]
             # make sure number of param values equals len(model.parameters)
             if new_params.shape[1] != len(self._model.parameters):
@@ -573,39 +601,45 @@ class Simulator(object):
         self._run_params = self._process_incoming_params(param_values)
         self._run_initials = self._process_incoming_initials(initials)
 
+        # param_values and initials are computed properties, so evaluate
+        # them once here rather than in every check
+        param_values = self.param_values
+        initials_length = self.initials_length
+
         # If only one set of param_values, run all simulations
         # with the same parameters
-        if len(self.param_values) == 1 and self.initials_length > 1:
-            new_params = np.repeat(self.param_values,
-                                   self.initials_length,
-                                   axis=0)
+        if len(param_values) == 1 and initials_length > 1:
+            new_params = np.repeat(param_values, initials_length, axis=0)
             self._run_params = new_params
+            param_values = self.param_values
 
         # Error checks on 'param_values' and 'initials'
-        if len(self.param_values) != self.initials_length:
+        if len(param_values) != initials_length:
             raise ValueError(
                     "'param_values' and 'initials' must be equal lengths.\n"
                     "len(param_values): %d\n"
                     "len(initials): %d" %
-                    (len(self.param_values), self.initials_length))
-        elif len(self.param_values.shape) != 2 or \
-                self.param_values.shape[1] != (
+                    (len(param_values), initials_length))
+        elif len(param_values.shape) != 2 or \
+                param_values.shape[1] != (
                     len(self._model.parameters) +
                     len(self._model._derived_parameters)):
             raise ValueError(
                     "'param_values' must be a 2D array of dimension N_SIMS x "
                     "len(model.parameters).\n"
-                    "param_values.shape: " + str(self.param_values.shape) +
+                    "param_values.shape: " + str(param_values.shape) +
                     "\nlen(model.parameters): %d" %
                     len(self._model.parameters))
 
-        if self.model.species and (len(self.initials.shape) != 2 or
-                self.initials.shape[1] != len(self._model.species)):
-            raise ValueError(
-                    "'initials' must be a 2D array of dimension N_SIMS x "
-                    "len(model.species).\n"
-                    "initials.shape: " + str(self.initials.shape) +
-                    "\nlen(model.species): %d" % len(self._model.species))
+        if self.model.species:
+            initials = self.initials
+            if len(initials.shape) != 2 or \
+                    initials.shape[1] != len(self._model.species):
+                raise ValueError(
+                        "'initials' must be a 2D array of dimension N_SIMS x "
+                        "len(model.species).\n"
+                        "initials.shape: " + str(initials.shape) +
+                        "\nlen(model.species): %d" % len(self._model.species))
 
         return None
 
@@ -792,7 +826,8 @@ class SimulationResult(object):
             self._y = None
 
         # Calculate ``yobs`` and ``yexpr`` based on values of ``y``
-        exprs = self._model.expressions_dynamic(include_local=False)
+        exprs_dynamic = self._model.expressions_dynamic()
+        exprs = ComponentSet(e for e in exprs_dynamic if not e.is_local)
         expr_names = [expr.name for expr in exprs]
         model_obs = self._model.observables
         obs_names = list(model_obs.keys())
@@ -810,6 +845,16 @@ class SimulationResult(object):
                                     '%s names not allowed' % name_type
                         raise ValueError(error_msg)
 
+        # Computing the dynamic expressions in particular is not cheap, so
+        # keep the names for use by the properties below
+        self._sp_names = tuple('__s%d' % i
+                               for i in range(len(self._model.species)))
+        self._obs_names = tuple(obs_names)
+        self._expr_names = tuple(expr_names)
+        # Local functions aren't stored, but still count as dynamic
+        # expressions for the purposes of the expressions property
+        self._has_dynamic_exprs = bool(exprs_dynamic)
+
         yobs_dtype = (list(zip(obs_names, itertools.repeat(float)))
                       if obs_names else float)
         yexpr_dtype = (list(zip(expr_names, itertools.repeat(float)))
@@ -818,10 +863,10 @@ class SimulationResult(object):
         if observables_and_expressions:
             # Observables and expression values are used as supplied
             self._nsims = len(observables_and_expressions)
-            self._yobs_view = [observables_and_expressions[n][:, 0:(len(
-                self._model.observables))] for n in range(self.nsims)]
-            self._yexpr_view = [observables_and_expressions[n][:, (len(
-                self._model.observables)):] for n in range(self.nsims)]
+            self._yobs_view = [observables_and_expressions[n][:, 0:len(
+                obs_names)] for n in range(self.nsims)]
+            self._yexpr_view = [observables_and_expressions[n][:, len(
+                obs_names):] for n in range(self.nsims)]
 
             self._yobs = [self._yobs_view[n].reshape(
                 len(tout[n]) * len(obs_names)).view(dtype=yobs_dtype) for n
@@ -830,40 +875,118 @@ class SimulationResult(object):
                 len(tout[n]) * len(expr_names)).view(dtype=yexpr_dtype) for n
                           in range(self.nsims)]
         else:
-            self._yobs = [np.ndarray((len(self.tout[n]),), dtype=yobs_dtype) if obs_names
-                          else np.ndarray((len(self.tout[n]), 0), dtype=yobs_dtype)
-                          for n in range(self.nsims)]
-            self._yobs_view = [self._yobs[n].view(float).
-                                   reshape(len(self._yobs[n]), -1) for n in range(
-                self.nsims)]
-            self._yexpr = [np.ndarray((len(self.tout[n]),), dtype=yexpr_dtype) if expr_names
-                           else np.ndarray((len(self.tout[n]), 0), dtype=yexpr_dtype)
-                           for n in range(self.nsims)]
-            self._yexpr_view = [self._yexpr[n].view(float).reshape(len(
-                self._yexpr[n]), -1) for n in range(self.nsims)]
+            # Species, observables and expressions for each simulation share
+            # one contiguous (time x columns) buffer, so the record array
+            # returned by :attr:`all` is a view rather than a copy
+            n_sp = len(self._model.species)
+            n_ob = len(obs_names)
+            n_ex = len(expr_names)
+            yfull_dtype = list(zip(self._sp_names, itertools.repeat(float)))
+            if obs_names:
+                yfull_dtype += yobs_dtype
+            if expr_names:
+                yfull_dtype += yexpr_dtype
+            trajectories = []
+            self._yobs = []
+            self._yobs_view = []
+            self._yexpr = []
+            self._yexpr_view = []
+            self._yfull = [] if yfull_dtype else None
+            # When all simulations have the same number of time points (the
+            # usual case), allocate them as one (sims x time x columns)
+            # array, so observables and expressions can be calculated for
+            # all simulations at once
+            if self.nsims and len(set(len(t) for t in self.tout)) == 1:
+                yall = np.empty((self.nsims, len(self.tout[0]),
+                                 n_sp + n_ob + n_ex))
+            else:
+                yall = None
+            for n in range(self.nsims):
+                n_t = len(self.tout[n])
+                ybuf = np.empty((n_t, n_sp + n_ob + n_ex)) if yall is None \
+                    else yall[n]
+                ybuf[:, :n_sp] = self._y[n]
+                trajectories.append(ybuf[:, :n_sp])
+                self._yobs_view.append(ybuf[:, n_sp:n_sp + n_ob])
+                self._yexpr_view.append(ybuf[:, n_sp + n_ob:])
+                self._yobs.append(np.ndarray(
+                    (n_t, ), dtype=yobs_dtype, buffer=ybuf,
+                    offset=n_sp * ybuf.itemsize, strides=ybuf.strides[:1]
+                ) if obs_names else self._yobs_view[n])
+                self._yexpr.append(np.ndarray(
+                    (n_t, ), dtype=yexpr_dtype, buffer=ybuf,
+                    offset=(n_sp + n_ob) * ybuf.itemsize,
+                    strides=ybuf.strides[:1]
+                ) if expr_names else self._yexpr_view[n])
+                if yfull_dtype:
+                    # Read only, so the aggregate can't be used to modify
+                    # the species, observables and expressions it shares
+                    # memory with
+                    yfull = ybuf.view(yfull_dtype).reshape(n_t)
+                    yfull.setflags(write=False)
+                    self._yfull.append(yfull)
+            self._y = trajectories
+
+            # Observable coefficients as a sparse (observables x species)
+            # matrix, so each simulation's observables are a single sparse
+            # matrix product. Observables usually only match a few species.
+            obs_indptr = np.cumsum([0] + [len(obs.species)
+                                          for obs in model_obs])
+            obs_coeffs = scipy.sparse.csr_matrix(
+                (np.concatenate([obs.coefficients for obs in model_obs] +
+                                [[]]),
+                 np.concatenate([obs.species for obs in model_obs] +
+                                [[]]).astype(int),
+                 obs_indptr),
+                shape=(len(model_obs), len(self._model.species)))
 
-            # loop over simulations
             sym_names = obs_names + param_names
-            expanded_exprs = [sympy.lambdify(sym_names, expr.expand_expr(),
-                                             "numpy") for expr in exprs]
-            for n in range(self.nsims):
+            expanded_exprs = [_lambdify_expression(tuple(sym_names),
+                                                   expr.expand_expr())
+                              for expr in exprs]
+            n_params = len(param_names)
+            if yall is not None:
                 if simulator:
                     simulator._logger.log(EXTENDED_DEBUG,
-                                          'Evaluating exprs/obs %d/%d'
-                                          % (n + 1, self.nsims))
-
-                # observables
-                for i, obs in enumerate(model_obs):
-                    self._yobs_view[n][:, i] = (
-                        self._y[n][:, obs.species] * obs.coefficients).sum(axis=1)
-
-                # expressions
-                sym_dict = dict((k, self._yobs[n][k]) for k in obs_names)
-                sym_dict.update(dict((p.name, self.param_values[
-                    n // self.n_sims_per_parameter_set][i]) for i, p in
-                                enumerate(self._model.parameters)))
+                                          'Evaluating exprs/obs for %d '
+                                          'simulations' % self.nsims)
+                # observables, for all time points of all simulations. yall
+                # is contiguous, so this reshape is a view.
+                yall_rows = yall.reshape(-1, yall.shape[2])
+                _dot_observables(obs_coeffs, yall_rows[:, :n_sp],
+                                 yall_rows[:, n_sp:n_sp + n_ob])
+
+                # expressions, with the parameter values as columns which
+                # broadcast along the time axis
+                pset_values = self.param_values[
+                    np.arange(self.nsims) // self.n_sims_per_parameter_set,
+                    :n_params]
+                sym_args = [yall[:, :, n_sp + j] for j in range(n_ob)]
+                sym_args.extend(pset_values[:, j, np.newaxis]
+                                for j in range(n_params))
                 for i, expr in enumerate(exprs):
-                    self._yexpr_view[n][:, i] = expanded_exprs[i](**sym_dict)
+                    yall[:, :, n_sp + n_ob + i] = expanded_exprs[i](*sym_args)
+            else:
+                # loop over simulations
+                for n in range(self.nsims):
+                    if simulator:
+                        simulator._logger.log(EXTENDED_DEBUG,
+                                              'Evaluating exprs/obs %d/%d'
+                                              % (n + 1, self.nsims))
+
+                    # observables
+                    _dot_observables(obs_coeffs, self._y[n],
+                                     self._yobs_view[n])
+
+                    # expressions, called with positional arguments in the
+                    # same order as sym_names (observable columns, then
+                    # parameters)
+                    pset_idx = n // self.n_sims_per_parameter_set
+                    sym_args = list(self._yobs_view[n].T)
+                    sym_args.extend(self.param_values[pset_idx][:n_params])
+                    for i, expr in enumerate(exprs):
+                        self._yexpr_view[n][:, i] = \
+                            expanded_exprs[i](*sym_args)
 
         if simulator:
             simulator._reset_run_overrides()
@@ -890,17 +1013,21 @@ class SimulationResult(object):
         """
         Aggregate species, observables, and expressions trajectories into
         a numpy.ndarray with record-style data-type for return to the user.
+
+        The arrays are read only. Unless observables and expressions were
+        supplied by the simulator, they share memory with :attr:`species`,
+        :attr:`observables` and :attr:`expressions`, rather than being
+        copies.
         """
         if self._yfull is None:
             if self._y is None:
                 yfull_dtype = []
             else:
-                sp_names = ['__s%d' % i
-                            for i in range(len(self._model.species))]
-                yfull_dtype = list(zip(sp_names, itertools.repeat(float)))
-            if len(self._model.observables):
+                yfull_dtype = list(zip(self._sp_names,
+                                       itertools.repeat(float)))
+            if self._obs_names:
                 yfull_dtype += self._yobs[0].dtype.descr
-            if len(self._model.expressions_dynamic()):
+            if self._expr_names:
                 yfull_dtype += self._yexpr[0].dtype.descr
             yfull = []
             # loop over simulations
@@ -924,7 +1051,8 @@ class SimulationResult(object):
         """
         A conversion of the trajectory sets (species, observables and
         expressions for all simulations) into a single
-        :py:class:`pandas.DataFrame`.
+        :py:class:`pandas.DataFrame`. The data is copied, so the DataFrame
+        can be modified independently of this SimulationResult.
         """
         if pd is None:
             raise Exception('Please "pip install pandas" for this feature')
@@ -955,7 +1083,7 @@ class SimulationResult(object):
         """
         List of trajectory sets. The first dimension contains observables.
         """
-        if not self._model.observables:
+        if not self._obs_names:
             raise ValueError('Model has no observables')
         return self._squeeze_output(self._yobs)
 
@@ -1065,7 +1193,7 @@ class SimulationResult(object):
         """
         List of trajectory sets. The first dimension contains expressions.
         """
-        if not self._model.expressions_dynamic():
+        if not self._has_dynamic_exprs:
             raise ValueError('Model has no dynamic expressions')
         return self._squeeze_output(self._yexpr)
 
@@ -1324,6 +1452,70 @@ class SimulationResult(object):
             return simres
 
 
+# Number of species values to multiply by the observable coefficients at once
+_OBS_BLOCK_SIZE = 2 ** 20
+
+
+def _dot_observables(obs_coeffs, y, out):
+    """Calculate observables from species trajectories into out
+
+    scipy makes a contiguous copy of the species (time x species) array's
+    transpose for the sparse product, so work through the time points in
+    blocks to bound the size of that copy.
+    """
+    block = max(1, _OBS_BLOCK_SIZE // max(1, y.shape[1]))
+    for start in range(0, len(y), block):
+        out[start:start + block] = obs_coeffs.dot(
+            y[start:start + block].T).T
+
+
+_EXPR_LAMBDA_CACHE = {}
+_EXPR_LAMBDA_CACHE_SIZE = 1024
+# numexpr evaluates through a numpy iterator, which is limited to 32 operands
+# (including the output) on numpy < 2
+_NUMEXPR_MAX_INPUTS = 31
+
+
+def _lambdify_expression(sym_names, expr, use_numexpr=True):
+    """Lambdify an expanded expression, reusing previously compiled functions
+
+    SimulationResult works on a copy of the model, so the same expressions
+    are seen again (as distinct sympy objects) every time a model is
+    simulated. The compiled function only depends on the arguments (names or
+    symbols) and the printed form of the expression, so that is used as the
+    cache key.
+
+    If numexpr is installed, it is used to evaluate the expression in a
+    single pass over the trajectory, without numpy temporaries for each
+    sub-expression. Expressions numexpr can't handle, including those with
+    functions it doesn't support or more inputs than it accepts, fall back
+    to numpy. Set use_numexpr
+    to False for expressions only evaluated a few times, where numexpr's
+    single pass gains nothing.
+    """
+    key = (sym_names, str(expr), use_numexpr)
+    try:
+        return _EXPR_LAMBDA_CACHE[key]
+    except KeyError:
+        pass
+    if len(_EXPR_LAMBDA_CACHE) >= _EXPR_LAMBDA_CACHE_SIZE:
+        _EXPR_LAMBDA_CACHE.clear()
+    func = None
+    if use_numexpr and numexpr is not None and \
+            0 < len(expr.free_symbols) <= _NUMEXPR_MAX_INPUTS and \
+            all(type(f).__name__ in _NUMEXPR_FUNCTIONS
+                for f in expr.atoms(sympy.core.function.Application)):
+        try:
+            func = sympy.lambdify(sym_names, expr, "numexpr")
+        except TypeError:
+            # Function not supported by numexpr
+            pass
+    if func is None:
+        func = sympy.lambdify(sym_names, expr, "numpy")
+    _EXPR_LAMBDA_CACHE[key] = func
+    return func
+
+
 def _allow_unicode_recarray():
     """Return True if numpy recarray can take unicode data type.
 
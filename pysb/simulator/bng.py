@@ -1,5 +1,6 @@
 from pysb.simulator.base import Simulator, SimulationResult, SimulatorException
 from pysb.bng import BngFileInterface, load_equations, generate_hybrid_model
+from pysb.generator.bng import format_complexpattern
 import numpy as np
 import logging
 from pysb.logging import EXTENDED_DEBUG
@@ -7,6 +8,8 @@ from pysb.core import as_complex_pattern, Parameter, \
     InvalidComplexPatternException
 import collections
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import os
 
 class BngSimulator(Simulator):
@@ -25,10 +28,28 @@ class BngSimulator(Simulator):
                                            verbose=verbose)
         self.cleanup = cleanup
         self._outdir = None
+        # BNG network file from a previous run, as (model key, contents)
+        self._netfile = None
+
+    def _network_key(self):
+        """ Key identifying the model components the network depends on """
+        # Detects structural changes (components added, removed or redefined,
+        # e.g. rule patterns, rates or an initial's fixed flag); parameter
+        # values are deliberately left out, as they are set on every run
+        model = self._model
+        return (tuple(repr(m) for m in model.monomers),
+                tuple(repr(c) for c in model.compartments),
+                tuple(p.name for p in model.parameters),
+                tuple(repr(e) for e in model.expressions),
+                tuple(repr(o) for o in model.observables),
+                tuple(repr(t) for t in model.tags),
+                tuple(repr(r) for r in model.rules),
+                tuple(repr(ic) for ic in model.initials))
 
     def run(self, tspan=None, initials=None, param_values=None, n_runs=1,
             method='ssa', output_dir=None, output_file_basename=None,
-            cleanup=None, population_maps=None, **additional_args):
+            cleanup=None, population_maps=None, num_processors=1,
+            invalidate_cache=False, **additional_args):
         """
         Simulate a model using BioNetGen
 
@@ -76,6 +97,15 @@ class BngSimulator(Simulator):
         population_maps: list of PopulationMap
             List of :py:class:`PopulationMap` objects for hybrid
             particle/population modeling. Only used when method='nf'.
+        num_processors : int
+            Number of BNG processes to run in parallel (default: 1). The
+            simulations are split between the processes, each of which runs
+            in its own temporary directory. This is only useful when running
+            more than one simulation (n_runs, initials and/or param_values).
+        invalidate_cache : bool, optional
+            The reaction network generated by BNG is kept and reused by
+            subsequent runs, as long as the model's structure is unchanged.
+            If True, discard it and generate the network again.
         additional_args: kwargs, optional
             Additional arguments to pass to BioNetGen
 
@@ -164,56 +194,129 @@ class BngSimulator(Simulator):
         else:
             model_to_load = self._model
 
-        with BngFileInterface(model_to_load,
-                              verbose=verbose_bool,
-                              output_dir=output_dir,
-                              output_prefix=output_file_basename,
-                              cleanup=cleanup,
-                              model_additional_species=model_additional_species
-                              ) as bngfile:
-            if hpp_bngl:
-                hpp_bngl_filename = os.path.join(bngfile.base_directory,
-                                                 'hpp_model.bngl')
-                self._logger.debug('HPP BNGL:\n\n' + hpp_bngl)
-                with open(hpp_bngl_filename, 'w') as f:
-                    f.write(hpp_bngl)
-            if method != 'nf':
-                # TODO: Write existing netfile if already generated
-                bngfile.action('generate_network', overwrite=True,
-                               verbose=extended_debug)
-            if output_file_basename is None:
-                prefix = 'pysb'
-            else:
-                prefix = output_file_basename
-
-            sim_prefix = 0
-            for pset_idx in range(n_param_sets):
-                for n in range(len(params_names)):
-                    bngfile.set_parameter(params_names[n],
-                                          self.param_values[pset_idx][n])
-                for cp, values in self.initials_dict.items():
-                    if population_maps:
-                        for pm in population_maps:
-                            if pm.complex_pattern.is_equivalent_to(cp):
-                                cp = pm.counter_species
-                                break
-                    bngfile.set_concentration(cp, values[pset_idx])
-                for sim_rpt in range(n_runs):
-                    tmp = additional_args.copy()
-                    tmp['prefix'] = '{}{}'.format(prefix, sim_prefix)
-                    bngfile.action('simulate', **tmp)
+        if output_file_basename is None:
+            prefix = 'pysb'
+        else:
+            prefix = output_file_basename
+
+        # Resolve the BNG species name for each initial condition once,
+        # rather than once per parameter set
+        initials = []
+        for cp, values in self.initials_dict.items():
+            species_name = None
+            if population_maps:
+                for pm in population_maps:
+                    if pm.complex_pattern.is_equivalent_to(cp):
+                        species_name = pm.counter_species
+                        break
+            if species_name is None:
+                species_name = format_complexpattern(
+                    as_complex_pattern(cp))
+            initials.append((species_name, values))
+
+        # Only the output prefix differs between simulate actions, so
+        # format the remaining (possibly long, e.g. sample_times)
+        # arguments once
+        simulate_args = BngFileInterface._format_action_args(
+            **additional_args)
+
+        # param_values is a computed property; evaluate it only once
+        param_values = self.param_values
+
+        # Reuse the network generated by a previous run of this model, rather
+        # than having BNG generate it again
+        netfile = None
+        if invalidate_cache:
+            self._netfile = None
+        if method != 'nf':
+            network_key = self._network_key()
+            if self._netfile is not None and self._netfile[0] == network_key:
+                self._logger.debug('Reusing previously generated network')
+                netfile = self._netfile[1]
+
+        # Simulations are independent, so split them into contiguous chunks,
+        # each run by a separate BNG process in its own temporary directory
+        n_chunks = max(1, min(num_processors, total_sims))
+        sim_chunks = np.array_split(np.arange(total_sims), n_chunks)
+
+        if n_chunks == 1:
+            self._logger.debug('Single processor (serial) mode')
+        else:
+            self._logger.debug('Multi-processor (parallel) mode using {} '
+                               'processes'.format(n_chunks))
+
+        with contextlib.ExitStack() as stack:
+            bngfiles = []
+            reload_netfiles = []
+            for sim_chunk in sim_chunks:
+                bngfile = stack.enter_context(BngFileInterface(
+                    model_to_load,
+                    verbose=verbose_bool,
+                    output_dir=output_dir,
+                    output_prefix=output_file_basename,
+                    cleanup=cleanup,
+                    model_additional_species=model_additional_species
+                ))
+                bngfiles.append(bngfile)
+                if hpp_bngl:
+                    hpp_bngl_filename = os.path.join(bngfile.base_directory,
+                                                     'hpp_model.bngl')
+                    self._logger.debug('HPP BNGL:\n\n' + hpp_bngl)
+                    with open(hpp_bngl_filename, 'w') as f:
+                        f.write(hpp_bngl)
+                    reload_netfiles.append(hpp_bngl_filename)
+                elif netfile is not None:
+                    with open(bngfile.net_filename, 'w') as f:
+                        f.write(netfile)
+                    reload_netfiles.append(True)
+                else:
+                    reload_netfiles.append(False)
+                if method != 'nf' and netfile is None:
+                    bngfile.action('generate_network', overwrite=True,
+                                   verbose=extended_debug)
+
+                last_pset_idx = None
+                for sim_idx in sim_chunk:
+                    pset_idx = sim_idx // n_runs
+                    # Parameters persist between simulations, but
+                    # resetConcentrations reverts to the model's initials,
+                    # so concentrations must be set before every simulation
+                    if pset_idx != last_pset_idx:
+                        for n in range(len(params_names)):
+                            bngfile.set_parameter(params_names[n],
+                                                  param_values[pset_idx][n])
+                        last_pset_idx = pset_idx
+                    for species_name, values in initials:
+                        bngfile.set_concentration(species_name,
+                                                  values[pset_idx])
+                    bngfile._queue_action('simulate', ','.join((
+                        simulate_args,
+                        bngfile._format_action_args(
+                            prefix='{}{}'.format(prefix, sim_idx))
+                    )))
                     bngfile.action('resetConcentrations')
-                    sim_prefix += 1
-            if hpp_bngl:
-                bngfile.execute(reload_netfile=hpp_bngl_filename,
+
+            def _execute(bngfile, reload_netfile):
+                bngfile.execute(reload_netfile=reload_netfile,
                                 skip_file_actions=True)
+
+            if n_chunks == 1:
+                _execute(bngfiles[0], reload_netfiles[0])
             else:
-                bngfile.execute()
+                # BNG runs in a subprocess, so threads suffice to keep
+                # several running at once
+                with ThreadPoolExecutor(max_workers=n_chunks) as executor:
+                    list(executor.map(_execute, bngfiles, reload_netfiles))
+
             if method != 'nf':
-                load_equations(self.model, bngfile.net_filename)
+                load_equations(self.model, bngfiles[0].net_filename)
+                if netfile is None:
+                    self._netfile = (network_key, bngfiles[0].read_netfile())
             list_of_yfull = \
                 BngFileInterface.read_simulation_results_multi(
-                [bngfile.base_filename + str(n) for n in range(total_sims)])
+                    [bngfile.base_filename + str(n)
+                     for bngfile, sim_chunk in zip(bngfiles, sim_chunks)
+                     for n in sim_chunk])
 
         tout = []
         species_out = []
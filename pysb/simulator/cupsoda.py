@@ -19,10 +19,6 @@ try:
     import pandas as pd
 except ImportError:
     pd = None
-try:
-    import pycuda.driver as cuda
-except ImportError:
-    cuda = None
 
 
 class CupSodaSimulator(Simulator):
@@ -218,6 +214,12 @@ class CupSodaSimulator(Simulator):
         self._len_species = len(self._model.species)
         self._len_params = len(self._model.parameters)
         self._model_parameters_rules = self._model.parameters_rules()
+        # The stoichiometry files are the same for every GPU and chunk, so
+        # only build them once
+        self._left_side = self._format_matrix(
+            self._reaction_stoichiometry('reactants'))
+        self._right_side = self._format_matrix(
+            self._reaction_stoichiometry('products'))
 
         # Set cupsoda verbosity level
         logger_level = self._logger.logger.getEffectiveLevel()
@@ -290,15 +292,8 @@ class CupSodaSimulator(Simulator):
                         gpu, chunk_idx, p_out.rstrip("at line"), p_err.rstrip()
                     )
                 )
-            tout_run, trajectories_run = self._load_trajectories(
-                _outdirs[gpu], sims[gpu])
-            if trajectories is None:
-                tout = tout_run
-                trajectories = trajectories_run
-            else:
-                tout = np.concatenate((tout, tout_run))
-                trajectories = np.concatenate(
-                    (trajectories, trajectories_run))
+            self._load_trajectories(_outdirs[gpu], sims[gpu], tout,
+                                    trajectories)
 
         return tout, trajectories
 
@@ -358,11 +353,14 @@ class CupSodaSimulator(Simulator):
 
         chunksize_total = chunksize_gpu * len(self.gpu)
 
-        tout = None
-        trajectories = None
+        # Allocate the output for all simulations up front; each chunk's
+        # results are loaded straight into their rows
+        tout = np.full((n_sims, len(self.tspan)), np.nan)
+        trajectories = np.full((n_sims, len(self.tspan), self._len_species),
+                               np.nan)
 
         chunks = np.array_split(range(n_sims),
-                                np.ceil(n_sims / chunksize_total))
+                                -(-n_sims // chunksize_total))
 
         try:
             for chunk_idx, chunk in enumerate(chunks):
@@ -406,6 +404,12 @@ class CupSodaSimulator(Simulator):
     def n_blocks(self):
         n_blocks = self.opts.get('n_blocks')
         if n_blocks is None:
+            # pycuda is only needed to query the GPU here, so don't load the
+            # CUDA driver just by importing pysb.simulator
+            try:
+                import pycuda.driver as cuda
+            except ImportError:
+                cuda = None
             default_threads_per_block = 32
             bytes_per_float = 4
             memory_per_thread = (self._len_species + 1) * bytes_per_float
@@ -420,12 +424,11 @@ class CupSodaSimulator(Simulator):
                 upper_limit_threads_per_block = attrs[
                     cuda.device_attribute.MAX_THREADS_PER_BLOCK]
                 max_threads_per_block = min(
-                    shared_memory_per_block / memory_per_thread,
+                    shared_memory_per_block // memory_per_thread,
                     upper_limit_threads_per_block)
                 threads_per_block = min(max_threads_per_block,
                                         default_threads_per_block)
-            n_blocks = int(
-                np.ceil(1. * len(self.param_values) / threads_per_block))
+            n_blocks = -(-len(self.param_values) // threads_per_block)
             self._logger.debug('n_blocks set to {} (used pycuda: {})'.format(
                 n_blocks, cuda is not None
             ))
@@ -443,22 +446,12 @@ class CupSodaSimulator(Simulator):
     def _create_input_files(self, directory, sims, cmtx):
         # atol_vector
         with open(os.path.join(directory, "atol_vector"), 'w') as atol_vector:
-            for i in range(self._len_species):
-                atol_vector.write(str(self.opts.get('atol')))
-                if i < self._len_species - 1:
-                    atol_vector.write("\n")
+            atol_vector.write('\n'.join(
+                [str(self.opts.get('atol'))] * self._len_species))
 
         # c_matrix
         with open(os.path.join(directory, "c_matrix"), 'w') as c_matrix:
-            for i in sims:
-                line = ""
-                for j in range(self._len_rxns):
-                    if j > 0:
-                        line += "\t"
-                    line += str(cmtx[i][j])
-                c_matrix.write(line)
-                if i != sims[-1]:
-                    c_matrix.write("\n")
+            c_matrix.write(self._format_matrix(cmtx[sims]))
 
         # cs_vector
         with open(os.path.join(directory, "cs_vector"), 'w') as cs_vector:
@@ -470,27 +463,11 @@ class CupSodaSimulator(Simulator):
                         self._out_species[i] = True
                 self._out_species = [i for i in range(self._len_species) if
                                      self._out_species[i] is True]
-            for i in range(len(self._out_species)):
-                if i > 0:
-                    cs_vector.write("\n")
-                cs_vector.write(str(self._out_species[i]))
+            cs_vector.write('\n'.join(str(i) for i in self._out_species))
 
         # left_side
         with open(os.path.join(directory, "left_side"), 'w') as left_side:
-            for i in range(self._len_rxns):
-                line = ""
-                for j in range(self._len_species):
-                    if j > 0:
-                        line += "\t"
-                    stoich = 0
-                    for k in self._model.reactions[i]['reactants']:
-                        if j == k:
-                            stoich += 1
-                    line += str(stoich)
-                if i < self._len_rxns - 1:
-                    left_side.write(line + "\n")
-                else:
-                    left_side.write(line)
+            left_side.write(self._left_side)
 
         # max_steps
         with open(os.path.join(directory, "max_steps"), 'w') as mxsteps:
@@ -511,32 +488,11 @@ class CupSodaSimulator(Simulator):
             if self.vol:
                 mx0 = mx0.copy()
                 mx0 /= (N_A * self.vol)
-            for i in sims:
-                line = ""
-                for j in range(self._len_species):
-                    if j > 0:
-                        line += "\t"
-                    line += str(mx0[i][j])
-                MX_0.write(line)
-                if i != sims[-1]:
-                    MX_0.write("\n")
+            MX_0.write(self._format_matrix(mx0[sims]))
 
         # right_side
         with open(os.path.join(directory, "right_side"), 'w') as right_side:
-            for i in range(self._len_rxns):
-                line = ""
-                for j in range(self._len_species):
-                    if j > 0:
-                        line += "\t"
-                    stochiometry = 0
-                    for k in self._model.reactions[i]['products']:
-                        if j == k:
-                            stochiometry += 1
-                    line += str(stochiometry)
-                if i < self._len_rxns - 1:
-                    right_side.write(line + "\n")
-                else:
-                    right_side.write(line)
+            right_side.write(self._right_side)
 
         # rtol
         with open(os.path.join(directory, "rtol"), 'w') as rtol:
@@ -544,57 +500,79 @@ class CupSodaSimulator(Simulator):
 
         # t_vector
         with open(os.path.join(directory, "t_vector"), 'w') as t_vector:
-            for t in self.tspan:
-                t_vector.write(str(float(t)) + "\n")
+            t_vector.write(''.join(str(float(t)) + "\n" for t in self.tspan))
 
         # time_max
         with open(os.path.join(directory, "time_max"), 'w') as time_max:
             time_max.write(str(float(self.tspan[-1])))
 
+    def _reaction_stoichiometry(self, side):
+        """Count each species' occurrences on one side of each reaction.
+
+        Parameters
+        ----------
+        side : str
+            'reactants' or 'products'
+
+        Returns
+        -------
+        A (reactions x species) integer array
+        """
+        reactions = self._model.reactions
+        rxn_idx = np.fromiter((i for i, rxn in enumerate(reactions)
+                               for _ in rxn[side]), dtype=int)
+        sp_idx = np.fromiter((sp for rxn in reactions for sp in rxn[side]),
+                             dtype=int)
+        stoich = np.zeros((self._len_rxns, self._len_species), dtype=int)
+        np.add.at(stoich, (rxn_idx, sp_idx), 1)
+        return stoich
+
+    @staticmethod
+    def _format_matrix(matrix):
+        """Format a 2D array as tab separated rows, one per line"""
+        return '\n'.join('\t'.join(str(v) for v in row) for row in matrix)
+
     def _get_cmatrix(self):
         if self.model.tags:
             raise ValueError('cupSODA does not currently support local '
                              'functions')
         self._logger.debug("Constructing the c_matrix:")
-        c_matrix = np.zeros((len(self.param_values), self._len_rxns))
+        param_values = self.param_values
+        c_matrix = np.zeros((len(param_values), self._len_rxns))
         par_names = [p.name for p in self._model_parameters_rules]
         rate_mask = np.array([p in self._model_parameters_rules for p in
                               self._model.parameters])
         rate_args = []
-        par_vals = self.param_values[:, rate_mask]
+        par_vals = param_values[:, rate_mask]
         rate_order = []
         for rxn in self._model.reactions:
             rate_args.append([arg for arg in rxn['rate'].atoms(sympy.Symbol) if
                               not arg.name.startswith('__s')])
             reactants = len(rxn['reactants'])
             rate_order.append(reactants)
-        output = 0.01 * len(par_vals)
-        output = int(output) if output > 1 else 1
-        for i in range(len(par_vals)):
-            if i % output == 0:
-                self._logger.debug(str(int(round(100. * i / len(par_vals)))) +
-                                   "%")
-            for j in range(self._len_rxns):
-                rate = 1.0
-                for r in rate_args[j]:
-                    if isinstance(r, pysb.Parameter):
-                        rate *= par_vals[i][par_names.index(r.name)]
-                    elif isinstance(r, pysb.Expression):
-                        raise ValueError('cupSODA does not currently support '
-                                         'models with Expressions')
-                    else:
-                        rate *= r
-                # volume correction
-                if self.vol:
-                    rate *= (N_A * self.vol) ** (rate_order[j] - 1)
-                c_matrix[i][j] = rate
-        self._logger.debug("100%")
+        par_index = {name: i for i, name in enumerate(par_names)}
+        for j in range(self._len_rxns):
+            # Each reaction's rate for all simulations at once
+            rate = np.ones(len(par_vals))
+            for r in rate_args[j]:
+                if isinstance(r, pysb.Parameter):
+                    rate *= par_vals[:, par_index[r.name]]
+                elif isinstance(r, pysb.Expression):
+                    raise ValueError('cupSODA does not currently support '
+                                     'models with Expressions')
+                else:
+                    rate *= r
+            # volume correction
+            if self.vol:
+                rate *= (N_A * self.vol) ** (rate_order[j] - 1)
+            c_matrix[:, j] = rate
         return c_matrix
 
-    def _load_trajectories(self, directory, sims):
+    def _load_trajectories(self, directory, sims, tout, trajectories):
         """Read simulation results from output files.
 
-        Returns `tout` and `trajectories` arrays.
+        The results are stored in place in the `tout` and `trajectories`
+        arrays, in the rows given by `sims`, which are also returned.
         """
         files = [filename for filename in os.listdir(directory) if
                  re.match(self._prefix, filename)]
@@ -606,16 +584,9 @@ class CupSodaSimulator(Simulator):
                 "Number of output files (%d) does not match number "
                 "of requested simulations (%d)." % (
                 len(files), len(sims)))
-        n_sims = len(files)
-        trajectories = [None] * n_sims
-        tout = [None] * n_sims
-        traj_n = np.ones((len(self.tspan), self._len_species)) * float('nan')
-        tout_n = np.ones(len(self.tspan)) * float('nan')
         # load the data
         indir_prefix = os.path.join(directory, self._prefix)
         for idx, n in enumerate(sims):
-            trajectories[idx] = traj_n.copy()
-            tout[idx] = tout_n.copy()
             filename = indir_prefix + "_" + str(idx)
             if not os.path.isfile(filename):
                 raise Exception("Cannot find input file " + filename)
@@ -629,12 +600,12 @@ class CupSodaSimulator(Simulator):
                 else:
                     data = self._load_with_openfile(filename)
             # store data
-            tout[idx] = data[:, 0]
-            trajectories[idx][:, self._out_species] = data[:, 1:]
+            tout[n] = data[:, 0]
+            trajectories[n][:, self._out_species] = data[:, 1:]
             # volume correction
             if self.vol:
-                trajectories[idx][:, self._out_species] *= (N_A * self.vol)
-        return np.array(tout), np.array(trajectories)
+                trajectories[n][:, self._out_species] *= (N_A * self.vol)
+        return tout, trajectories
 
     def _test_pandas(self, filename):
         """ calculates the fastest method to load in data
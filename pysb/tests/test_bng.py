@@ -8,6 +8,7 @@ from nose.tools import assert_raises_regexp
 from pysb.generator.bng import BngPrinter
 import sympy
 import math
+import numpy as np
 
 
 @with_model
@@ -58,6 +59,92 @@ def test_sequential_simulations():
         ok_(yfull2.size == 51)
 
 
+@with_model
+def test_read_simulation_results_cache_parsed():
+    Monomer('A')
+    Parameter('A_0', 1)
+    Initial(A(), A_0)
+    Parameter('k', 1)
+    Rule('degrade', A() >> None, k)
+    with BngFileInterface(model) as bng:
+        bng.action('generate_network')
+        bng.action('simulate', method='ssa', t_end=20000, n_steps=100)
+        bng.execute()
+        yfull = bng.read_simulation_results()
+        yfull1, = bng.read_simulation_results_multi([bng.base_filename],
+                                                    cache_parsed=True)
+        ok_(os.path.exists(bng.base_filename + '.npy'))
+        yfull2, = bng.read_simulation_results_multi([bng.base_filename],
+                                                    cache_parsed=True)
+        ok_(isinstance(yfull2, np.memmap))
+        ok_(yfull.dtype == yfull2.dtype)
+        ok_(np.array_equal(yfull.view(float), yfull1.view(float)))
+        ok_(np.array_equal(yfull.view(float), yfull2.view(float)))
+
+        # Rewriting the BNG output invalidates the cache, even if the
+        # rewrite keeps the original mtime
+        cdat_filename = bng.base_filename + '.cdat'
+        cdat_stat = os.stat(cdat_filename)
+        with open(cdat_filename, 'r') as f:
+            cdat_lines = f.readlines()
+        with open(cdat_filename, 'w') as f:
+            f.writelines(cdat_lines[:-10])
+        os.utime(cdat_filename, ns=(cdat_stat.st_atime_ns,
+                                    cdat_stat.st_mtime_ns))
+        del yfull1, yfull2
+        yfull3, = bng.read_simulation_results_multi([bng.base_filename],
+                                                    cache_parsed=True)
+        ok_(len(yfull3) == len(yfull) - 10)
+
+        # Without any BNG output, the cache must not be used
+        del yfull3
+        os.remove(cdat_filename)
+        assert_raises(BngInterfaceError,
+                      bng.read_simulation_results_multi,
+                      [bng.base_filename], cache_parsed=True)
+
+
+def test_read_bng_data_empty():
+    # No data (e.g. a .cdat file with only its header line) gives the same
+    # shape with or without pandas
+    import pysb.bng
+    import io
+    import warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = np.loadtxt(io.StringIO('# time\n'), skiprows=1, ndmin=2)
+    ok_(pysb.bng._read_bng_data(io.StringIO('# time\n'),
+                                skiprows=1).shape == expected.shape)
+    ok_(pysb.bng._read_bng_data(io.StringIO('')).shape == expected.shape)
+
+
+@with_model
+def test_read_simulation_results_multi():
+    Monomer('A')
+    Parameter('A_0', 100)
+    Initial(A(), A_0)
+    Rule('degrade', A() >> None, Parameter('k', 1))
+    Observable('A_obs', A())
+    with BngFileInterface(model) as bng:
+        bng.action('generate_network')
+        for i in range(4):
+            bng.action('simulate', method='ssa', t_end=5, n_steps=50,
+                       seed=i + 1, prefix='sim%d' % i)
+            bng.action('resetConcentrations')
+        bng.execute()
+        base_filenames = [os.path.join(bng.base_directory, 'sim%d' % i)
+                          for i in range(4)]
+        # Several files are read in parallel threads (when pandas is
+        # available), but results are returned in order
+        results = bng.read_simulation_results_multi(base_filenames)
+        ok_(len(results) == 4)
+        for base_filename, yfull in zip(base_filenames, results):
+            yfull1, = bng.read_simulation_results_multi([base_filename])
+            ok_(yfull.dtype.names == ('time', '__s0', 'A_obs'))
+            ok_(np.array_equal(yfull.view(float), yfull1.view(float)))
+        ok_(not np.array_equal(results[0]['A_obs'], results[1]['A_obs']))
+
+
 @with_model
 def test_compartment_species_equivalence():
     Parameter('p', 1)
@@ -0,0 +1,80 @@
+from pysb.testing import *
+from pysb import Monomer, Parameter, Initial, Observable, Rule, Expression
+from pysb.bng import generate_equations
+from pysb.examples import robertson
+from pysb.tools import render_reactions
+from nose.plugins.skip import SkipTest
+try:
+    import pygraphviz
+except ImportError:
+    pygraphviz = None
+
+
+def _render(model, **kwargs):
+    if pygraphviz is None:
+        raise SkipTest('pygraphviz is not installed')
+    return pygraphviz.AGraph(string=render_reactions.run(model, **kwargs))
+
+
+def _edges(graph):
+    return {(a, b, graph.get_edge(a, b).attr['arrowhead'],
+             graph.get_edge(a, b).attr['style'] or None)
+            for a, b in graph.edges()}
+
+
+def test_robertson():
+    graph = _render(robertson.model)
+    assert graph.is_strict()
+    assert graph.graph_attr['rankdir'] == 'LR'
+    assert set(graph.nodes()) == {'s0', 's1', 's2', 'r0', 'r1', 'r2'}
+    assert graph.get_node('s0').attr['label'] == 'A()\\l'
+    assert graph.get_node('s0').attr['shape'] == 'Mrecord'
+    assert graph.get_node('r0').attr['shape'] == 'circle'
+    # All species have initial conditions
+    for i in range(3):
+        assert graph.get_node('s%d' % i).attr['fillcolor'] == '#aaffff'
+    assert _edges(graph) == {
+        ('s0', 'r0', 'normal', None),
+        ('r0', 's1', 'normal', None),
+        ('s1', 'r1', 'odiamond', None),
+        ('r1', 's2', 'normal', None),
+        ('s1', 'r2', 'normal', None),
+        ('s2', 'r2', 'odiamond', None),
+        ('r2', 's0', 'normal', None),
+    }
+
+
+@with_model
+def test_include_rate_species():
+    Monomer('A')
+    Monomer('B')
+    Monomer('C')
+    Initial(A(), Parameter('A_0', 100))
+    Initial(C(), Parameter('C_0', 10))
+    Observable('C_obs', C())
+    Expression('k_C', Parameter('k', 1) * C_obs)
+    Rule('A_to_B', A() >> B(), k_C)
+
+    graph = _render(model)
+    assert _edges(graph) == {('s0', 'r0', 'normal', None),
+                             ('r0', 's2', 'normal', None)}
+    assert graph.get_node('s1').attr['fillcolor'] == '#aaffff'
+    assert graph.get_node('s2').attr['fillcolor'] == '#ccffcc'
+
+    graph = _render(model, include_rate_species=True)
+    assert not graph.is_strict()
+    assert _edges(graph) == {('s0', 'r0', 'normal', None),
+                             ('r0', 's2', 'normal', None),
+                             ('s1', 'r0', 'normal', 'dashed')}
+
+
+@with_model
+def test_reaction_rule_not_in_model():
+    Monomer('A')
+    Initial(A(), Parameter('A_0', 100))
+    Rule('A_deg', A() >> None, Parameter('k', 1))
+    generate_equations(model)
+    for reaction in model.reactions_bidirectional:
+        reaction['rule'] = ('removed_rule', )
+    graph = _render(model, include_rate_species=True)
+    assert 'r0' in graph.nodes()
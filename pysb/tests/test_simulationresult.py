@@ -1,8 +1,9 @@
 from pysb.simulator import ScipyOdeSimulator, BngSimulator
 from pysb.simulator.base import SimulationResult
+import pysb.simulator.base
 from pysb.examples import tyson_oscillator, robertson, \
     expression_observables, earm_1_3, bax_pore_sequential, bax_pore, \
-    bngwiki_egfr_simple
+    bngwiki_egfr_simple, localfunc
 from pysb.bng import generate_equations
 import numpy as np
 import tempfile
@@ -13,6 +14,9 @@ import collections
 import copy
 import io
 import pandas as pd
+from pysb import Monomer, Parameter, Initial, Observable, Expression, Rule
+from pysb.testing import with_model
+from pysb.core import as_complex_pattern
 
 
 def test_simres_dataframe():
@@ -50,6 +54,79 @@ def test_simres_dataframe():
                          len(model.species) + len(model.observables))
 
 
+def test_simres_all():
+    """ Test SimulationResult.all matches the component trajectories """
+    model = expression_observables.model
+    tspan = np.linspace(0, 1, 11)
+    param_values = np.repeat([[p.value for p in model.parameters]], 3,
+                             axis=0)
+    param_values[:, 0] *= [1, 2, 3]
+    simres = ScipyOdeSimulator(model, tspan=tspan).run(
+        param_values=param_values)
+    assert simres.nsims == 3
+    for n in range(simres.nsims):
+        yfull = simres.all[n]
+        for i in range(len(model.species)):
+            assert np.array_equal(yfull['__s%d' % i],
+                                  simres.species[n][:, i])
+        for name in simres.observables[n].dtype.names:
+            assert np.array_equal(yfull[name], simres.observables[n][name])
+        for name in simres.expressions[n].dtype.names:
+            assert np.array_equal(yfull[name], simres.expressions[n][name])
+        # .all shares memory with the components, so is read only
+        assert not yfull.flags.writeable
+        assert_raises(ValueError, yfull.__setitem__, 0, yfull[1])
+
+    # The dataframe is a copy, so modifying it leaves the result unchanged
+    df = simres.dataframe
+    df.iloc[0, 0] = -1
+    assert simres.species[0][0, 0] != -1
+
+
+def test_simres_local_functions():
+    """ Test a model whose only dynamic expressions are local functions """
+    model = localfunc.model
+    tspan = np.linspace(0, 1, 11)
+    simres = ScipyOdeSimulator(model, tspan=tspan).run()
+    # Local functions aren't stored, so there are no expression columns
+    assert simres.expressions.shape == (len(tspan), 0)
+    assert simres.all.dtype.names == \
+        tuple('__s%d' % i for i in range(len(model.species))) + \
+        tuple(model.observables.keys())
+
+
+@with_model
+def test_simres_multi_observables_expressions():
+    """ Test observables and expressions for simulations of equal length """
+    Monomer('A', ['s'], {'s': ['u', 'p']})
+    Parameter('k', 1)
+    Initial(A(s='u'), Parameter('A_0', 100))
+    Observable('A_tot', A())
+    Observable('A_p', A(s='p'))
+    Expression('e', k * A_tot + A_p)
+    Rule('phos', A(s='u') >> A(s='p'), k)
+
+    tspan = np.linspace(0, 1, 11)
+    # Use small blocks for the observable calculation, to check the blocks
+    # are combined correctly
+    obs_block_size = pysb.simulator.base._OBS_BLOCK_SIZE
+    pysb.simulator.base._OBS_BLOCK_SIZE = 4
+    try:
+        simres = ScipyOdeSimulator(model, tspan=tspan).run(
+            param_values={'k': [1, 2, 3]})
+    finally:
+        pysb.simulator.base._OBS_BLOCK_SIZE = obs_block_size
+    assert simres.nsims == 3
+    a_p_idx = model.get_species_index(as_complex_pattern(A(s='p')))
+    for n, k_val in enumerate([1, 2, 3]):
+        species = simres.species[n]
+        a_tot = species.sum(axis=1)
+        a_p = species[:, a_p_idx]
+        assert np.allclose(simres.observables[n]['A_tot'], a_tot)
+        assert np.allclose(simres.observables[n]['A_p'], a_p)
+        assert np.allclose(simres.expressions[n]['e'], k_val * a_tot + a_p)
+
+
 def test_simres_observable():
     """ Test on demand observable evaluation """
     models = [tyson_oscillator.model, robertson.model,
@@ -59,6 +59,57 @@ class TestBngSimulator(object):
         species = np.array(x.all)
         assert species[0][0][0] == 100.
 
+    def test_multi_processors(self):
+        param_values = [[100, 100, 100, 0, 0], [200, 100, 100, 0, 0]]
+        x_serial = self.sim.run(n_runs=3, param_values=param_values,
+                                method='ssa', seed=_BNG_SEED)
+        x_parallel = self.sim.run(n_runs=3, param_values=param_values,
+                                  method='ssa', seed=_BNG_SEED,
+                                  num_processors=4)
+        assert len(x_parallel.species) == 6
+        for s, p in zip(x_serial.species, x_parallel.species):
+            assert np.allclose(s, p)
+
+    def test_multi_processors_initials(self):
+        A = self.mon('A')
+        initials = {A(a=None): [1, 2]}
+        results = [self.sim.run(n_runs=2, method='ode', initials=initials,
+                                num_processors=num_processors)
+                   for num_processors in (1, 2, 3, 4)]
+        for x in results:
+            assert np.allclose([s[0, 0] for s in x.species], [1, 1, 2, 2])
+            assert np.allclose(x.species, results[0].species)
+
+    def test_reuse_network(self):
+        x1 = self.sim.run(method='ode')
+        assert self.sim._netfile is not None
+        x2 = self.sim.run(method='ode', param_values={'ksynthA': 200})
+        x3 = self.sim.run(method='ode')
+        assert np.allclose(x1.species, x3.species)
+        assert not np.allclose(x1.species, x2.species)
+
+    def test_reuse_network_model_changed(self):
+        x1 = self.sim.run(method='ode')
+        netfile = self.sim._netfile
+        # Changing a rule without renaming it must regenerate the network
+        rule = self.model.rules['AB_bind']
+        rule.rule_expression.is_reversible = rule.is_reversible = True
+        rule.rate_reverse = self.model.parameters['ksynthA']
+        x2 = self.sim.run(method='ode')
+        assert self.sim._netfile[0] != netfile[0]
+        assert not np.allclose(x1.species, x2.species)
+        # So must changing whether an initial is fixed
+        self.model.initials[0].fixed = True
+        self.sim.run(method='ode')
+        assert self.sim._netfile[0][-1] != netfile[0][-1]
+
+    def test_reuse_network_invalidate_cache(self):
+        self.sim.run(method='ode')
+        netfile = self.sim._netfile
+        self.sim.run(method='ode', invalidate_cache=True)
+        assert self.sim._netfile is not netfile
+        assert self.sim._netfile[0] == netfile[0]
+
     def test_bng_pla(self):
         self.sim.run(n_runs=5, method='pla', seed=_BNG_SEED)
 
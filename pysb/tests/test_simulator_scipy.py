@@ -1,6 +1,7 @@
 from pysb.testing import *
 import sys
 import copy
+import sympy
 import numpy as np
 from pysb import Monomer, Parameter, Initial, Observable, Rule, Expression
 from pysb.simulator import ScipyOdeSimulator, InconsistentParameterError
@@ -409,6 +410,73 @@ def test_integrate_with_expression():
     assert np.allclose(keff_vals, 1.8181818181818182e-05)
 
 
+@with_model
+def test_integrate_with_wide_expression():
+    """Ensure expressions with more inputs than numexpr supports evaluate."""
+    n_monomers = 40
+    Parameter('kdeg', 1)
+    obs = []
+    for i in range(n_monomers):
+        mon = Monomer('A%d' % i)
+        Initial(mon(), Parameter('A%d_0' % i, i + 1))
+        obs.append(Observable('A%d_obs' % i, mon()))
+        Rule('A%d_deg' % i, mon() >> None, kdeg)
+    Expression('A_tot', sum(obs))
+
+    time = np.linspace(0, 1, 11)
+    simres = ScipyOdeSimulator(model, tspan=time).run()
+    assert np.allclose(simres.expressions['A_tot'],
+                       simres.species.sum(axis=1))
+    assert np.isclose(simres.expressions['A_tot'][0],
+                      n_monomers * (n_monomers + 1) / 2)
+
+
+@with_model
+def test_integrate_with_max_min_expressions():
+    """Ensure expressions using Max and Min of observables evaluate."""
+    Monomer('A')
+    Monomer('B')
+    Initial(A(), Parameter('A_0', 10))
+    Initial(B(), Parameter('B_0', 5))
+    Observable('A_obs', A())
+    Observable('B_obs', B())
+    Rule('A_deg', A() >> None, Parameter('kdeg', 1))
+    Expression('mx', sympy.Max(A_obs, B_obs))
+    Expression('mn', sympy.Min(A_obs, B_obs))
+
+    time = np.linspace(0, 2, 21)
+    simres = ScipyOdeSimulator(model, tspan=time).run()
+    a = simres.observables['A_obs']
+    b = simres.observables['B_obs']
+    assert np.allclose(simres.expressions['mx'], np.maximum(a, b))
+    assert np.allclose(simres.expressions['mn'], np.minimum(a, b))
+
+
+@with_model
+def test_initial_expression_many_parameters():
+    """Ensure an initial set by an expression of many parameters is used."""
+    Monomer('A')
+    ps = [Parameter('p%d' % i, 1) for i in range(35)]
+    Initial(A(), Expression('A0', sum(ps)))
+    Rule('A_deg', A() >> None, Parameter('kdeg', 0))
+
+    simres = ScipyOdeSimulator(model, tspan=np.linspace(0, 1, 11)).run()
+    assert np.allclose(simres.species[:, 0], 35)
+
+
+@with_model
+def test_initial_expression_keyword_parameter():
+    """Ensure initial expressions can use parameters named like keywords."""
+    Monomer('A')
+    lambda_ = Parameter('lambda', 3)
+    Initial(A(), Expression('A0', lambda_ * 2))
+    Rule('A_deg', A() >> None, Parameter('kdeg', 0))
+
+    simres = ScipyOdeSimulator(model, tspan=np.linspace(0, 1, 11)).run(
+        param_values={'lambda': [3, 4]})
+    assert np.allclose([s[0, 0] for s in simres.species], [6, 8])
+
+
 def test_set_initial_to_zero():
     sim = ScipyOdeSimulator(robertson.model, tspan=np.linspace(0, 100))
     simres = sim.run(initials={robertson.model.monomers['A'](): 0})
@@ -93,30 +93,38 @@ def run(model, include_rate_species=False):
     if include_rate_species:
         strict = False
 
-    graph = pygraphviz.AGraph(directed=True, rankdir="LR", strict=strict)
-    ic_species = [ic.pattern for ic in model.initials]
+    # Write the graph out as dot text and parse it in one go, rather than
+    # adding each node and edge through pygraphviz
+    lines = []
+    # Find the species with an initial condition up front, rather than
+    # comparing every species against every initial
+    species_index = pysb.core._SpeciesIndex(model)
+    ic_species = {species_index[ic.pattern] for ic in model.initials}
     for i, cp in enumerate(model.species):
         species_node = 's%d' % i
         slabel = re.sub(r'% ', r'%\\l', str(cp))
         slabel += '\\l'
         color = "#ccffcc"
         # color species with an initial condition differently
-        if len([s for s in ic_species if s.is_equivalent_to(cp)]):
+        if i in ic_species:
             color = "#aaffff"
-        graph.add_node(species_node,
-                       label=slabel,
-                       shape="Mrecord",
-                       fillcolor=color, style="filled", color="transparent",
-                       fontsize="12",
-                       margin="0.06,0")
+        add_node(lines, species_node,
+                 label=slabel,
+                 shape="Mrecord",
+                 fillcolor=color, style="filled", color="transparent",
+                 fontsize="12",
+                 margin="0.06,0")
+    # Rules produce many reactions, so only find rate species once per
+    # expression
+    expr_species = {}
     for i, reaction in enumerate(model.reactions_bidirectional):
         reaction_node = 'r%d' % i
-        graph.add_node(reaction_node,
-                       label=reaction_node,
-                       shape="circle",
-                       fillcolor="lightgray", style="filled", color="transparent",
-                       fontsize="12",
-                       width=".3", height=".3", margin="0.06,0")
+        add_node(lines, reaction_node,
+                 label=reaction_node,
+                 shape="circle",
+                 fillcolor="lightgray", style="filled", color="transparent",
+                 fontsize="12",
+                 width=".3", height=".3", margin="0.06,0")
         reactants = set(reaction['reactants'])
         products = set(reaction['products'])
         modifiers = reactants & products
@@ -127,36 +135,50 @@ def run(model, include_rate_species=False):
         rule = model.rules.get(reaction['rule'][0])
         # Add a dashed edge when reaction forward and/or reverse parameters are
         # expressions that contain observables
-        if include_rate_species:
+        if include_rate_species and rule is not None:
             sps_forward = set()
             if isinstance(rule.rate_forward, pysb.core.Expression):
-                sps_forward = sp_from_expression(rule.rate_forward)
+                sps_forward = _cached_sp_from_expression(
+                    expr_species, rule.rate_forward)
                 for s in sps_forward:
-                    r_link(graph, s, i, **{'style': 'dashed'})
+                    r_link(lines, s, i, **{'style': 'dashed'})
 
             if isinstance(rule.rate_reverse, pysb.core.Expression):
-                sps_reverse = sp_from_expression(rule.rate_reverse)
+                sps_reverse = _cached_sp_from_expression(
+                    expr_species, rule.rate_reverse)
                 # Don't add edges that were added with forward parameters
                 sps_reverse = sps_reverse - sps_forward
                 for s in sps_reverse:
-                    r_link(graph, s, i, **{'style': 'dashed'})
+                    r_link(lines, s, i, **{'style': 'dashed'})
 
         for s in reactants:
-            r_link(graph, s, i, **attr_reversible)
+            r_link(lines, s, i, **attr_reversible)
         for s in products:
-            r_link(graph, s, i, _flip=True, **attr_reversible)
+            r_link(lines, s, i, _flip=True, **attr_reversible)
         for s in modifiers:
-            r_link(graph, s, i, arrowhead="odiamond")
+            r_link(lines, s, i, arrowhead="odiamond")
+    graph = pygraphviz.AGraph(
+        string='%sdigraph "" {\ngraph [rankdir=LR];\nnode [label="\\N"];\n'
+               '%s}\n' % ('strict ' if strict else '', ''.join(lines)))
     return graph.string()
 
 
-def r_link(graph, s, r, **attrs):
+def _dot_attrs(attrs):
+    return ', '.join('%s="%s"' % (k, str(v).replace('"', '\\"'))
+                     for k, v in attrs.items())
+
+
+def add_node(lines, node, **attrs):
+    lines.append('%s [%s];\n' % (node, _dot_attrs(attrs)))
+
+
+def r_link(lines, s, r, **attrs):
     nodes = ('s%d' % s, 'r%d' % r)
     if attrs.get('_flip'):
         del attrs['_flip']
         nodes = reversed(nodes)
     attrs.setdefault('arrowhead', 'normal')
-    graph.add_edge(*nodes, **attrs)
+    lines.append('%s -> %s [%s];\n' % (*nodes, _dot_attrs(attrs)))
 
 
 def sp_from_expression(expression):
@@ -167,6 +189,15 @@ def sp_from_expression(expression):
             expr_sps += sps
     return set(expr_sps)
 
+
+def _cached_sp_from_expression(cache, expression):
+    try:
+        return cache[id(expression)]
+    except KeyError:
+        sps = cache[id(expression)] = sp_from_expression(expression)
+        return sps
+
+
 usage = __doc__
 usage = usage[1:]  # strip leading newline
 